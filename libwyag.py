@@ -1,52 +1,145 @@
 #------------------------------------------------------------------------------------------------#
 #                                     Import Statements                                          #
 #------------------------------------------------------------------------------------------------#
-import argparse
-import collections
-import configparser
-import grp
+import functools
 import hashlib
+import mmap
 import os
-import pwd
 import re
+import stat
 import sys
+import threading
 import zlib
 
-from datetime import datetime
-from fnmatch import fnmatch
-from math import ceil
+from types import SimpleNamespace
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+try:
+    import deflate
+except ImportError:
+    deflate = None
 
 #------------------------------------------------------------------------------------------------#
 #                                     Argument Parser                                            #
 #------------------------------------------------------------------------------------------------#
 
-argparse = argparse.ArgumentParser(description="Parse the commands needed by the program")
-argsubparsers = argparse.add_subparsers(title="Command", dest="command")
-argsubparsers.required = True
+_OBJECT_TYPES = ("blob", "commit", "tag", "tree")
 
-# argparser for init command
-argsp = argsubparsers.add_parser("init", help="Initialize a new, empty repositoyr")
-argsp.add_argument("path", metavar="directory", nargs="?", default=".", help="Where to create the repository.")
+def _parse_args(argv):
+    """
+    Parses the command line by hand for the common, well-formed invocations.
 
-# argparser for cat-file command
-argsp = argsubparsers.add_parser("cat-file", help="Provide content of repository objects")
-argsp.add_argument("type", metavar="type", choices=["blob", "commit", "tag", "tree"], help="Specify the type")
-argsp.add_argument("object", metavar="object", help="The object to display")
+    `argparse` is comparatively expensive to import and set up, and scripts often call these
+    commands in a loop. This handles plain positional arguments and the `-t`/`-w` flags of
+    `hash-object`. Anything else (help, unknown options, wrong arity, invalid types) is left to
+    `argparse`, so usage and error messages are unchanged.
 
-# argparser for hash-object command
-argsp = argsubparsers.add_parser("hash-object", help="Compute object ID and optionally creates a blob from a file")
-argsp.add_argument("-t", metavar="type", dest="type", choices=["blob", "commit", "tag", "tree"], default="blob", help="Specify the type")
-argsp.add_argument("-w", dest="write", action="store_true", help="Write the object into the database")
-argsp.add_argument("path", help="Read object from <file>")
+    Args:
+        argv (list): Command-line arguments passed to the program.
 
-#  argparser for log command
-argsp = argsubparsers.add_parser("log", help="Display history of the given commit")
-argsp.add_argument("commit", default="HEAD", nargs="?", help="Commit to start at.")
+    Returns:
+        SimpleNamespace: The parsed arguments, with the same attributes `argparse` would set.
+        None: If the command line must be parsed by `argparse`.
+    """
+    if not argv:
+        return None
+    command, rest = argv[0], argv[1:]
+
+    if command == "hash-object":
+        object_type, write, paths = "blob", False, []
+        i = 0
+        while i < len(rest):
+            arg = rest[i]
+            if arg == "-w":
+                write = True
+            elif arg == "-t" and i + 1 < len(rest) and rest[i + 1] in _OBJECT_TYPES:
+                object_type = rest[i + 1]
+                i += 1
+            elif arg.startswith("-"):
+                return None
+            else:
+                paths.append(arg)
+            i += 1
+        if len(paths) != 1:
+            return None
+        return SimpleNamespace(command=command, type=object_type, write=write, path=paths[0])
+
+    if any(arg.startswith("-") for arg in rest):
+        return None
+
+    match command:
+        case "init" if len(rest) <= 1:
+            return SimpleNamespace(command=command, path=rest[0] if rest else ".")
+        case "cat-file" if len(rest) == 2 and rest[0] in _OBJECT_TYPES:
+            return SimpleNamespace(command=command, type=rest[0], object=rest[1])
+        case "log" if len(rest) <= 1:
+            return SimpleNamespace(command=command, commit=rest[0] if rest else "HEAD")
+    return None
+
+def _build_init_parser(argsubparsers):
+    argsp = argsubparsers.add_parser("init", help="Initialize a new, empty repositoyr")
+    argsp.add_argument("path", metavar="directory", nargs="?", default=".", help="Where to create the repository.")
+
+def _build_cat_file_parser(argsubparsers):
+    argsp = argsubparsers.add_parser("cat-file", help="Provide content of repository objects")
+    argsp.add_argument("type", metavar="type", choices=_OBJECT_TYPES, help="Specify the type")
+    argsp.add_argument("object", metavar="object", help="The object to display")
+
+def _build_hash_object_parser(argsubparsers):
+    argsp = argsubparsers.add_parser("hash-object", help="Compute object ID and optionally creates a blob from a file")
+    argsp.add_argument("-t", metavar="type", dest="type", choices=_OBJECT_TYPES, default="blob", help="Specify the type")
+    argsp.add_argument("-w", dest="write", action="store_true", help="Write the object into the database")
+    argsp.add_argument("path", help="Read object from <file>")
+
+def _build_log_parser(argsubparsers):
+    argsp = argsubparsers.add_parser("log", help="Display history of the given commit")
+    argsp.add_argument("commit", default="HEAD", nargs="?", help="Commit to start at.")
+
+_SUBPARSER_FACTORIES = {
+    "init"          : _build_init_parser,
+    "cat-file"      : _build_cat_file_parser,
+    "hash-object"   : _build_hash_object_parser,
+    "log"           : _build_log_parser,
+}
+
+@functools.lru_cache(maxsize=None)
+def _build_argparser():
+    """
+    Builds the command-line parser, with a subparser for every supported command.
+
+    `argparse` is only imported, and the parser only built, when `_parse_args` cannot handle the
+    command line, so importing the module and common invocations do not pay for it. That path is
+    mostly help requests and usage errors, so every subparser is always added: usage and error
+    messages list all commands, exactly as when the parser was built at import time. The parser is
+    memoized, so repeated calls from the same process reuse it.
+
+    Returns:
+        ArgumentParser: The parser for all supported commands.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Parse the commands needed by the program")
+    argsubparsers = parser.add_subparsers(title="Command", dest="command")
+    argsubparsers.required = True
+
+    for factory in _SUBPARSER_FACTORIES.values():
+        factory(argsubparsers)
+
+    return parser
 
 #------------------------------------------------------------------------------------------------#
 #                                     Classes                                                    #
 #------------------------------------------------------------------------------------------------#
 
+BLOB = b'blob'
+COMMIT = b'commit'
+TREE = b'tree'
+TAG = b'tag'
+
 class GitRepository:
     """
     Represents a Git repository with its working directory and configuration.
@@ -54,7 +147,9 @@ class GitRepository:
     Attributes:
         worktree (str): The path to the working tree of the repository.
         gitdir (str): The path to the `.git` directory.
-        config (ConfigParser): Configuration object for the repository.
+        objects_dir (str): The path to the `.git/objects` directory, precomputed for object lookups.
+        config (dict): The repository configuration as returned by `_parse_git_config`. It may be
+            shared with other instances opened on the same repository and must be treated as read-only.
     """
 
     def __init__(self, path, force=False):
@@ -70,23 +165,39 @@ class GitRepository:
         """
         self.worktree = path
         self.gitdir = os.path.join(path, ".git")
+        self.objects_dir = os.path.join(self.gitdir, "objects")
+        self._known_shas = {}
 
         if not (force or os.path.isdir(self.gitdir)):
             raise Exception(f"Not a Git repository {path}")
 
-        self.config = configparser.ConfigParser()
         conf = repo_file(self, "config")
+        config = repo_config_load(conf) if conf else None
 
-        if conf and os.path.exists(conf):
-            self.config.read([conf])
+        if config is not None:
+            self.config = config
         elif not force:
             raise Exception("Configuration file missing")
+        else:
+            self.config = {}
 
         if not force:
-            vers = int(self.config.get("core", "repositoryformatversion"))
+            vers = int(self.config["core"]["repositoryformatversion"])
             if vers != 0:
                 raise Exception(f"Unsupported repositoryformatversion {vers}")
 
+    def object_path(self, sha):
+        """
+        Returns the path of the loose object file for `sha`.
+
+        Args:
+            sha (str): The full hexadecimal object name.
+
+        Returns:
+            str: The path under `objects_dir`. The file may not exist.
+        """
+        return _object_path(self.objects_dir, sha)
+
 class GitObject(object):
     """
     A generic base class for Git objects, providing a template for serialization and deserialization.
@@ -111,9 +222,10 @@ class GitObject(object):
         Otherwise, it will initialize an empty object by calling the `init()` method.
 
         Args:
-            data (bytes, optional): The raw byte data used to load the object. Defaults to None.
+            data (bytes-like, optional): The raw byte data used to load the object, such as the
+                memoryview payload handed over by `object_read`. Defaults to None.
         """
-        if data != None:
+        if data is not None:
             self.deserialize(data)
         else:
             self.init()
@@ -141,7 +253,9 @@ class GitObject(object):
         data should be converted into the object's internal representation.
 
         Args:
-            data (bytes): The raw byte data used to populate the object's attributes.
+            data (bytes-like): The raw byte data used to populate the object's attributes. It may be
+                a memoryview into the decompressed object; subclasses that keep parsed pieces of it
+                should call `bytes()` on what they need.
 
         Raises:
             Exception: If the method is not implemented in a subclass.
@@ -175,7 +289,7 @@ class GitBlob(GitObject):
         deserialize(data): Loads the raw binary content into the blob object.
     """
 
-    object_type = b'blob'
+    object_type = BLOB
 
     def serialize(self):
         """
@@ -197,7 +311,8 @@ class GitBlob(GitObject):
         It is used when reading the object from the Git repository.
 
         Args:
-            data (bytes): The raw binary content to be loaded into the blob.
+            data (bytes-like): The raw binary content to be loaded into the blob. When read from the
+                repository this is a memoryview over the decompressed object, not a copy.
         """
         self.blobdata = data
 
@@ -230,10 +345,10 @@ class GitCommit(GitObject):
     init():
         Initializes an empty dictionary for the kvlm attribute.
     """
-    object_type = b'commit'
+    object_type = COMMIT
 
     def deserialize(self, data):
-        self.kvlm = kvlm_parse(data)
+        self.kvlm = kvlm_parse(bytes(data))
 
     def serialize(self):
         return kvlm_serialize(self.kvlm)
@@ -242,10 +357,17 @@ class GitCommit(GitObject):
         self.kvlm = dict()
 
 class GitTag(GitObject):
-    pass
+    object_type = TAG
 
 class GitTree(GitObject):
-    pass
+    object_type = TREE
+
+_TYPE_CLS = {
+    COMMIT  : GitCommit,
+    TREE    : GitTree,
+    TAG     : GitTag,
+    BLOB    : GitBlob,
+}
 
 #------------------------------------------------------------------------------------------------#
 #                                     Methods                                                    #
@@ -264,10 +386,48 @@ def repo_path(repo, *path):
     """
     return os.path.join(repo.gitdir, *path)
 
+_stat_cache = {}
+
+def _cached_stat(path, fresh=False):
+    """
+    Returns the `stat` result for a path, remembering directories for later calls.
+
+    Only directories are cached, since a missing path or a plain file may appear or change at any
+    time. A cached directory can still be removed behind wyag's back, so callers about to create
+    something inside it pass `fresh=True` to bypass the cache. Call `_stat_cache.clear()` to
+    forget every entry.
+
+    Args:
+        path (str): The path to stat.
+        fresh (bool): If True, ignore any cached entry and stat the path again.
+
+    Returns:
+        os.stat_result or None: The stat result, or None if the path does not exist.
+    """
+    if fresh:
+        _stat_cache.pop(path, None)
+    else:
+        try:
+            return _stat_cache[path]
+        except KeyError:
+            pass
+
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+
+    if stat.S_ISDIR(st.st_mode):
+        _stat_cache[path] = st
+    return st
+
 def repo_dir(repo, *path, mkdir=False):
     """
     Ensures that a directory exists inside the `.git` structure.
 
+    Lookups go through `_cached_stat`. With `mkdir=True` the directory is always stat'ed again, so
+    a directory removed since it was cached is re-created instead of being reported as present.
+
     Args:
         repo (GitRepository): The repository object.
         path (str): Subpaths inside the repository.
@@ -281,14 +441,18 @@ def repo_dir(repo, *path, mkdir=False):
     """
     path = repo_path(repo, *path)
 
-    if os.path.exists(path):
-        if os.path.isdir(path):
+    st = _cached_stat(path, fresh=mkdir)
+
+    if st is not None:
+        if stat.S_ISDIR(st.st_mode):
             return path
         else:
             raise Exception(f"Not a directory {path}")
 
     if mkdir:
-        os.makedirs(path)
+        # exist_ok covers another writer creating the directory since the stat above.
+        os.makedirs(path, exist_ok=True)
+        _cached_stat(path, fresh=True)
         return path
     else:
         return None
@@ -308,21 +472,179 @@ def repo_file(repo, *path, mkdir=False):
     if repo_dir(repo, *path[:-1], mkdir=mkdir):
         return repo_path(repo, *path)
 
-def repo_default_config():
+_CONFIG_CACHE = {}
+_CONFIG_LOCK = threading.Lock()
+
+def repo_config_load(path):
     """
-    Creates a default configuration for a new repository.
+    Loads a repository configuration file, reusing a previously parsed copy when possible.
+
+    Parsed configs are cached per path together with the file's `(st_mtime_ns, st_size, st_ino)`
+    signature. A single `os.stat` decides whether the cached config is still valid; the inode is
+    part of the key so that a config rewritten through an atomic rename is picked up even if its
+    mtime and size happen to match.
+
+    Args:
+        path (str): The path to the configuration file.
 
     Returns:
-        ConfigParser: A configuration object with default values for core settings.
+        dict: The parsed configuration, see `_parse_git_config`. It is shared between callers and
+            must not be modified.
+        None: If the file does not exist.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    with _CONFIG_LOCK:
+        cached = _CONFIG_CACHE.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+    # utf-8-sig skips a leading byte order mark, which git also accepts.
+    with open(path, encoding="utf-8-sig", errors="surrogateescape") as f:
+        config = _parse_git_config(f.read())
+
+    with _CONFIG_LOCK:
+        _CONFIG_CACHE[path] = (signature, config)
+    return config
+
+_CONFIG_SECTION_RE = re.compile(r'\[([A-Za-z0-9.-]+)(?:[ \t]+"((?:[^"\\\n]|\\.)*)")?\]')
+_CONFIG_SUB_ESCAPE_RE = re.compile(r'\\(.)')
+_CONFIG_KEY_RE = re.compile(r'([A-Za-z][A-Za-z0-9-]*)[ \t]*')
+_CONFIG_ESCAPES = {"n": "\n", "t": "\t", "b": "\b", '"': '"', "\\": "\\"}
+
+def _parse_git_config(text):
     """
-    ret = configparser.ConfigParser()
+    Parses the text of a git config file into nested dictionaries.
+
+    This is a small single-pass reader covering what wyag needs from `.git/config`, without the
+    cost of building a `ConfigParser`. It follows git's syntax: section and key names are
+    case-insensitive, so they are lowercased, while a subsection is kept verbatim, as in
+    `remote "origin"`. A key may follow its section header on the same line, and a key given
+    without a value is a boolean true. Values are read as described in `_parse_config_value`.
+
+    Args:
+        text (str): The content of the config file.
+
+    Returns:
+        dict: A mapping of section name to a dict of key/value strings.
 
-    ret.add_section("core")
-    ret.set("core", "repositoryformatversion", "0")
-    ret.set("core", "filemode", "false")
-    ret.set("core", "bare", "false")
+    Raises:
+        Exception: If the text is not valid git config syntax.
 
-    return ret
+    Example:
+        >> _parse_git_config('[core] bare = false\\n[remote "origin"]\\n\\turl = "x y" # c\\n')
+        {'core': {'bare': 'false'}, 'remote "origin"': {'url': 'x y'}}
+    """
+    text = text.replace("\r\n", "\n")
+    config = {}
+    section = None
+    i, n = 0, len(text)
+
+    while i < n:
+        c = text[i]
+        if c in " \t\n":
+            i += 1
+        elif c in "#;":
+            i = _config_line_end(text, i)
+        elif c == "[":
+            m = _CONFIG_SECTION_RE.match(text, i)
+            if m is None:
+                raise _config_error(text, i, "malformed section header")
+            name = m.group(1).lower()
+            if m.group(2) is not None:
+                sub = _CONFIG_SUB_ESCAPE_RE.sub(r"\1", m.group(2))
+                name = f'{name} "{sub}"'
+            section = config.setdefault(name, {})
+            i = m.end()
+        else:
+            m = _CONFIG_KEY_RE.match(text, i)
+            if m is None:
+                raise _config_error(text, i, "malformed key")
+            if section is None:
+                raise _config_error(text, i, "entry outside of a section")
+            key = m.group(1).lower()
+            i = m.end()
+            if i == n or text[i] == "\n":
+                section[key] = "true"
+            elif text[i] == "=":
+                section[key], i = _parse_config_value(text, i + 1)
+            else:
+                raise _config_error(text, i, f"expected '=' after {key}")
+
+    return config
+
+def _parse_config_value(text, i):
+    """
+    Reads a config value starting at `text[i]`, the character after the `=`.
+
+    As in git: whitespace around the value is dropped and runs of unquoted whitespace inside it
+    become that many spaces; double quotes group text, including `#`, `;` and spaces, and are
+    removed; `\\n`, `\\t`, `\\b`, `\\"` and `\\\\` are unescaped; a backslash at the end of a
+    line continues the value on the next line; an unquoted `#` or `;` starts a comment.
+
+    Args:
+        text (str): The config text, with `\\n` line endings.
+        i (int): The offset where the value starts.
+
+    Returns:
+        tuple: `(value, offset)`, where `offset` is just past the end of the value's line.
+
+    Raises:
+        Exception: On an unknown escape or an unterminated quote.
+    """
+    out = []
+    spaces = 0
+    quoted = False
+    n = len(text)
+
+    while True:
+        c = text[i] if i < n else "\n"
+        i += 1
+        if c == "\n":
+            if quoted:
+                raise _config_error(text, i - 1, "unterminated quote")
+            return "".join(out), i
+        if not quoted:
+            if c in " \t":
+                if out:
+                    spaces += 1
+                continue
+            if c in "#;":
+                return "".join(out), _config_line_end(text, i)
+        if spaces:
+            out.append(" " * spaces)
+            spaces = 0
+        if c == "\\":
+            e = text[i] if i < n else "\n"
+            i += 1
+            if e == "\n":
+                continue
+            if e not in _CONFIG_ESCAPES:
+                raise _config_error(text, i - 2, f"bad escape \\{e}")
+            out.append(_CONFIG_ESCAPES[e])
+        elif c == '"':
+            quoted = not quoted
+        else:
+            out.append(c)
+
+def _config_line_end(text, i):
+    """
+    Returns the offset of the newline ending the line that contains `text[i]`, or `len(text)`.
+    """
+    end = text.find("\n", i)
+    return len(text) if end < 0 else end
+
+def _config_error(text, i, what):
+    """
+    Builds the exception for a config syntax error at offset `i`, reporting its line number.
+    """
+    return Exception(f"Bad config line {text.count(chr(10), 0, i) + 1}: {what}")
+
+_DEFAULT_CONFIG = b"[core]\n\trepositoryformatversion = 0\n\tfilemode = false\n\tbare = false\n"
 
 def repo_create(path):
     """
@@ -342,27 +664,34 @@ def repo_create(path):
     if os.path.exists(repo.worktree):
         if not os.path.isdir(repo.worktree):
             raise Exception(f"{path} is not a directory!")
-        if os.path.exists(repo.gitdir) and os.listdir(repo.gitdir):
+        try:
+            with os.scandir(repo.gitdir) as entries:
+                nonempty = next(entries, None) is not None
+        except FileNotFoundError:
+            nonempty = False
+        if nonempty:
             raise Exception(f"{path} is not empty!")
     else:
-        os.mkdirs(repo.worktree)
+        os.makedirs(repo.worktree)
 
-    assert repo_dir(repo, "branches", mkdir=True)
-    assert repo_dir(repo, "objects", mkdir=True)
-    assert repo_dir(repo, "refs", "tags", mkdir=True)
-    assert repo_dir(repo, "refs", "heads", mkdir=True)
+    for sub in ("branches", "objects", os.path.join("refs", "tags"), os.path.join("refs", "heads")):
+        os.makedirs(os.path.join(repo.gitdir, sub), exist_ok=True)
 
     with open(repo_file(repo, "description"), "w") as f:
         f.write("Unnamed repository; edit this file 'description' to name the repository.\n")
-    with open(repo_file(repo, "HEAD"), "w") as f:
-        config = repo_default_config()
-        config.write(f)
+    with open(repo_file(repo, "HEAD"), "wb") as f:
+        f.write(b"ref: refs/heads/master\n")
+    with open(repo_file(repo, "config"), "wb") as f:
+        f.write(_DEFAULT_CONFIG)
+
+    # A directory below the new worktree may have resolved to an enclosing repository until now.
+    _repo_find_cached.cache_clear()
 
     return repo
 
 def repo_find(path=".", required=True):
     """
-    Recursively searches for the root of a Git repository starting from the given path.
+    Searches for the root of a Git repository starting from the given path.
 
     This function looks for a `.git` directory to identify the root of the repository.
     It starts from the provided path (or the current directory by default) and moves up
@@ -389,23 +718,184 @@ def repo_find(path=".", required=True):
 
     Explanation:
         Given a path within a project, this function ensures that Git commands will operate
-        on the correct repository root, even if invoked from nested subdirectories.
+        on the correct repository root, even if invoked from nested subdirectories. The starting
+        path is resolved once with `realpath`; parents are then derived with `os.path.dirname`.
+        The walk is cached per starting directory; a cached result whose `.git` has disappeared is
+        walked again, and `repo_create` clears the cache. A new `GitRepository` is built on every
+        call, so configuration changes are picked up; its config comes from `repo_config_load`,
+        which only costs a `stat` when the file is unchanged.
 
     """
     path = os.path.realpath(path)
 
-    if os.path.isdir(os.path.join(path, ".git")):
-        return GitRepository(path)
-    
-    parent = os.path.realpath(os.path.join(path, ".."))
-
-    if parent == path:
+    try:
+        worktree = _repo_find_cached(path)
+        if not os.path.isdir(os.path.join(worktree, ".git")):
+            # The repository was removed since the walk was cached.
+            _repo_find_cached.cache_clear()
+            worktree = _repo_find_cached(path)
+        return GitRepository(worktree)
+    except FileNotFoundError:
         if required:
             raise Exception("No git directory")
-        else:
-            return None
-    
-    return repo_find(parent, required)
+        return None
+
+@functools.lru_cache(maxsize=32)
+def _repo_find_cached(path):
+    """
+    Walks up from the canonical `path` to the nearest worktree and returns its path, memoizing the result.
+
+    Raises `FileNotFoundError` instead of returning None when no repository is found, so that misses
+    are not cached and a repository created later is still found.
+    """
+    while True:
+        if os.path.isdir(os.path.join(path, ".git")):
+            return path
+
+        parent = os.path.dirname(path)
+
+        if parent == path:
+            raise FileNotFoundError(".git")
+
+        path = parent
+
+def _compression_level(repo):
+    """
+    Returns the compression level to use for loose objects written to `repo`.
+
+    Follows git's settings: `core.looseCompression` if set, else `core.compression`, where -1 means
+    zlib's default (6). When neither is set, level 1 is used: on small loose objects it compresses
+    about as well as level 6 at a fraction of the CPU cost, and inflate speed does not depend on
+    the level.
+
+    Args:
+        repo (GitRepository): The repository being written to.
+
+    Returns:
+        int: A compression level between 0 and 9.
+
+    Raises:
+        Exception: If the configured level is not an integer between -1 and 9, as git rejects it too.
+    """
+    core = repo.config.get("core", {})
+    key = "loosecompression" if "loosecompression" in core else "compression"
+    value = core.get(key, "1")
+
+    try:
+        level = int(value)
+    except ValueError:
+        level = None
+    if level is None or not -1 <= level <= 9:
+        raise Exception(f"Bad zlib compression level {value!r} for core.{key}")
+
+    return 6 if level == -1 else level
+
+def _compress(data, level=6):
+    """
+    Compresses a whole loose object in a single shot.
+
+    Uses libdeflate (through the `deflate` package) when it is installed, since a loose object is
+    always available as one complete buffer and does not need zlib's streaming state. Falls back
+    to the standard `zlib` module otherwise. Both produce a regular zlib stream.
+
+    Args:
+        data (bytes): The uncompressed object, header included.
+        level (int): The compression level. Defaults to 6, the zlib default.
+
+    Returns:
+        bytes: The zlib-compressed data.
+    """
+    if deflate is not None:
+        return deflate.zlib_compress(data, level)
+    return zlib.compress(data, level)
+
+_HEADER_MAX = 64
+_HEADER_PEEK = 512
+_INFLATE_CHUNK = 64 * 1024
+_MMAP_THRESHOLD = 64 * 1024
+
+def _object_header(raw):
+    """
+    Parses the `<type> <size>\x00` header at the start of a decompressed object.
+
+    Both delimiters are searched for within the first `_HEADER_MAX` bytes only, so a large payload
+    is never scanned. The size digits are converted with `int()` directly on the bytes, without
+    decoding them first.
+
+    Args:
+        raw (bytes-like): The decompressed object, or at least its first bytes.
+
+    Returns:
+        tuple: `(object_type, size, start)`, where `start` is the offset of the payload.
+        None: If `raw` does not start with a well-formed header.
+    """
+    x = raw.find(b' ', 0, _HEADER_MAX)
+    y = raw.find(b'\x00', x + 1, _HEADER_MAX)
+    if x < 0 or y < 0 or not raw[x+1:y].isdigit():
+        return None
+    return bytes(raw[0:x]), int(raw[x+1:y]), y + 1
+
+def _decompress(data):
+    """
+    Decompresses a whole loose object into a buffer of its final size.
+
+    Git objects carry their size in the `<type> <size>\x00` header, so the first few bytes are
+    inflated with `zlib` to read it, and the output buffer is sized exactly once:
+
+    - With libdeflate available, the whole stream is handed to its single-shot decompressor.
+    - Otherwise, large inputs are inflated chunk by chunk with a `zlib.decompressobj` into a
+      pre-allocated `bytearray`, so the output is never grown and copied, and a memory-mapped
+      input is never copied into a bytes object. Small inputs just use `zlib.decompress`.
+
+    If the header does not match the stream, plain `zlib.decompress` is used instead so that the
+    caller still sees the real (possibly malformed) content.
+
+    Args:
+        data (bytes-like): The zlib-compressed object as stored on disk, or a memory map of it.
+
+    Returns:
+        bytes-like: The decompressed object, header included.
+    """
+    if deflate is None and len(data) <= _MMAP_THRESHOLD:
+        return zlib.decompress(data)
+
+    with memoryview(data) as src:
+        header = _object_header(zlib.decompressobj().decompress(src[:_HEADER_PEEK], _HEADER_MAX))
+        if header is None:
+            return zlib.decompress(data)
+        total = header[2] + header[1]
+
+        if deflate is not None:
+            try:
+                return deflate.zlib_decompress(data, total)
+            except deflate.DeflateError:
+                return zlib.decompress(data)
+
+        out = bytearray(total)
+        pos = 0
+        d = zlib.decompressobj()
+        with memoryview(out) as dst:
+            for i in range(0, len(src), _INFLATE_CHUNK):
+                chunk = d.decompress(src[i:i + _INFLATE_CHUNK])
+                if pos + len(chunk) > total:
+                    break
+                dst[pos:pos + len(chunk)] = chunk
+                pos += len(chunk)
+                if d.eof:
+                    break
+
+    if not d.eof or pos != total:
+        return zlib.decompress(data)
+    return out
+
+# Insertion-ordered dict used as an LRU: hits are moved to the end, the oldest entry is evicted.
+# Values are `(object, payload_size)`; `_object_cache_bytes` is the sum of the sizes.
+_OBJECT_CACHE = {}
+_OBJECT_CACHE_LOCK = threading.Lock()
+_OBJECT_CACHE_ENTRIES = 4096
+_OBJECT_CACHE_BYTES = 64 << 20
+_OBJECT_CACHE_MAX_SIZE = 1 << 20
+_object_cache_bytes = 0
 
 def object_read(repo, sha):
     """
@@ -436,38 +926,177 @@ def object_read(repo, sha):
 
     Explanation:
         1. The function constructs the file path for the given SHA-1 hash inside the `.git/objects/` directory.
-        2. It decompresses the object file using `zlib`.
+           Reading never creates directories, so the path is joined directly instead of going through
+           `repo_file`, which would stat the fan-out directory first. The file is then opened directly;
+           `FileNotFoundError` signals a missing object, so no separate existence check is made.
+        2. It decompresses the object file using libdeflate, or `zlib` when it is not installed.
+           Files larger than `_MMAP_THRESHOLD` are memory-mapped and inflated straight from the
+           mapping instead of being read into an intermediate bytes object.
         3. It extracts the object type and size from the header.
         4. It validates the size of the object's content.
-        5. Based on the object type, it instantiates and returns the corresponding Git object.
+        5. Based on the object type, looked up in `_TYPE_CLS`, it instantiates and returns the corresponding Git object.
+           The payload is passed as a memoryview into the decompressed buffer rather than a sliced copy.
         6. If the object file is missing, it returns `None`.
         7. If the type is unrecognized or the size is malformed, it raises an exception.
+
+        Parsed objects up to `_OBJECT_CACHE_MAX_SIZE` bytes are kept in a per-process LRU cache keyed
+        by repository and SHA-1, so reading the same object again returns the same instance. Larger
+        blobs are not cached, so one big file cannot pin its whole content in memory. The cache holds
+        at most `_OBJECT_CACHE_ENTRIES` objects and `_OBJECT_CACHE_BYTES` bytes of payload in total,
+        evicting the least recently used objects beyond either limit. Callers must not modify objects
+        returned by this function.
     """
-    path = repo_file(repo, "objects", sha[0:2], sha[2:])
+    key = (repo.objects_dir, sha)
+
+    global _object_cache_bytes
 
-    if not os.path.isfile(path):
+    with _OBJECT_CACHE_LOCK:
+        entry = _OBJECT_CACHE.pop(key, None)
+        if entry is not None:
+            _OBJECT_CACHE[key] = entry
+            return entry[0]
+
+    try:
+        obj, size = _object_load(repo.objects_dir, sha)
+    except FileNotFoundError:
         return None
-    
-    with open(path, "rb") as f:
-        raw = zlib.decompress(f.read())
 
-        x = raw.find(b' ')
-        object_type = raw[0:x]
+    if size <= _OBJECT_CACHE_MAX_SIZE:
+        with _OBJECT_CACHE_LOCK:
+            old = _OBJECT_CACHE.pop(key, None)
+            if old is not None:
+                _object_cache_bytes -= old[1]
+            _OBJECT_CACHE[key] = (obj, size)
+            _object_cache_bytes += size
+            while len(_OBJECT_CACHE) > _OBJECT_CACHE_ENTRIES or _object_cache_bytes > _OBJECT_CACHE_BYTES:
+                _object_cache_bytes -= _OBJECT_CACHE.pop(next(iter(_OBJECT_CACHE)))[1]
+    return obj
+
+def _object_path(objects_dir, sha):
+    """
+    Joins `objects_dir` with the fan-out directory and file name of `sha`.
+
+    `objects_dir` is already a clean path, so a plain f-string replaces `os.path.join` and its
+    per-component checks.
+    """
+    return f"{objects_dir}{os.sep}{sha[0:2]}{os.sep}{sha[2:]}"
+
+def _object_load(objects_dir, sha):
+    """
+    Reads and parses the loose object `sha` from the repository's `objects_dir`.
+
+    The file is opened without checking for it first; a missing object raises `FileNotFoundError`
+    from `open`. Returns `(object, payload_size)` so that `object_read` can decide whether to cache it.
+    """
+    with open(_object_path(objects_dir, sha), "rb") as f:
+        if os.fstat(f.fileno()).st_size > _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                raw = _decompress(mm)
+        else:
+            raw = _decompress(f.read())
 
-        y = raw.find(b'\x00', x)
-        size = int(raw[x+1:y].decode("ascii"))
-        if size != len(raw) - y - 1:
+        header = _object_header(raw)
+        if header is None:
+            raise Exception(f"Malformed object {sha}: bad header")
+
+        object_type, size, start = header
+        if size != len(raw) - start:
             raise Exception(f"Malformed object {sha}: bad length")
         
-        match object_type:
-            case b'commit'      : c=GitCommit
-            case b'tree'        : c=GitTree
-            case b'tag'         : c=GitTag
-            case b'blob'        : c=GitBlob
-            case _:
-                raise Exception(f"Unknown type {object_type.decode("ascii")} for object {sha}")
+        c = _TYPE_CLS.get(object_type)
+        if c is None:
+            raise Exception(f"Unknown type {object_type.decode('ascii', 'replace')} for object {sha}")
         
-        return c(raw[y + 1])
+        return c(memoryview(raw)[start:]), size
+
+def objects_iter(repo):
+    """
+    Enumerates the loose objects stored in a repository.
+
+    The fan-out directories and their entries are listed with `os.scandir`, so existence and
+    type come from the directory entries themselves and no per-object `stat` is needed.
+
+    Args:
+        repo (GitRepository): The repository whose objects are listed.
+
+    Yields:
+        tuple: `(sha, path)` for every loose object file.
+
+    Example:
+        >> for sha, path in objects_iter(repo):
+        >>     print(sha)
+    """
+    try:
+        top = os.scandir(repo.objects_dir)
+    except FileNotFoundError:
+        return
+
+    with top:
+        for d in top:
+            if len(d.name) != 2 or not d.is_dir():
+                continue
+            with os.scandir(d.path) as entries:
+                for e in entries:
+                    if len(e.name) == 38 and e.is_file():
+                        yield d.name + e.name, e.path
+
+def prefetch_objects(repo, shas, workers=None):
+    """
+    Reads several Git objects concurrently and returns them keyed by SHA-1.
+
+    Reading a loose object is mostly file I/O and decompression, and both release the GIL. Walks
+    that know which objects they need next (e.g. the parents of the commits being logged) can
+    read them in a thread pool, overlapping disk access and inflation across cores. The objects
+    also land in `object_read`'s cache, so the walk's own reads of them are served from memory.
+    This is `object_read_many` with duplicates removed and the result keyed by SHA-1.
+
+    Args:
+        repo (GitRepository): The repository from which the objects are read.
+        shas (iterable of str): The SHA-1 hashes of the objects to read.
+        workers (int, optional): The number of worker threads. Defaults to `os.cpu_count()`.
+
+    Returns:
+        dict: A mapping from each SHA-1 hash to its `GitObject`, or to None if the object is missing.
+
+    Example:
+        >> objs = prefetch_objects(repo, commit.kvlm[b'parent'])
+        >> parent = objs[sha]
+    """
+    shas = list(dict.fromkeys(shas))
+    return dict(zip(shas, object_read_many(repo, shas, workers)))
+
+def object_read_many(repo, shas, workers=None):
+    """
+    Reads several Git objects in a thread pool and returns them in the order requested.
+
+    This is the bulk counterpart of `object_read` for traversals that read many objects at once
+    (history, trees). File reads and decompression release the GIL, so the reads genuinely run in
+    parallel. A single object is read inline, without starting a pool.
+
+    Args:
+        repo (GitRepository): The repository from which the objects are read.
+        shas (iterable of str): The SHA-1 hashes of the objects to read.
+        workers (int, optional): The number of worker threads. Defaults to `os.cpu_count()`.
+
+    Returns:
+        list: The `GitObject` for each SHA-1 hash, or None where the object is missing.
+
+    Example:
+        >> blobs = object_read_many(repo, [sha1, sha2, sha3])
+    """
+    shas = list(shas)
+    if len(shas) <= 1:
+        return [object_read(repo, sha) for sha in shas]
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as ex:
+        return list(ex.map(lambda sha: object_read(repo, sha), shas))
+
+# Insertion-ordered dict used as an LRU, as for `_OBJECT_CACHE`.
+_OBJECT_WRITE_CACHE = {}
+_OBJECT_WRITE_CACHE_LOCK = threading.Lock()
+_OBJECT_WRITE_CACHE_ENTRIES = 4096
 
 def object_write(obj, repo=None):
     """
@@ -499,28 +1128,224 @@ def object_write(obj, repo=None):
 
     Explanation:
         1. The object is serialized using the `serialize()` method of the Git object.
-        2. The serialized data is formatted as: `<object_type> <size>\x00<data>`.
-        3. A SHA-1 hash of the object is computed to act as its unique identifier.
+        2. The header `<object_type> <size>\x00` is built for the serialized data.
+        3. A SHA-1 hash of the header followed by the data is computed to act as its unique identifier,
+           without first concatenating the two.
         4. If a repository is provided:
             - The object is written to the `.git/objects/` directory in the appropriate subdirectory.
             - If necessary, directories are created.
-            - If the object already exists, it is not overwritten.
+            - If the object already exists, it is not overwritten, and nothing is compressed.
         5. The function returns the computed SHA-1 hash.
+
+        When the optional `blake3` package is installed, the serialized data is first fingerprinted
+        with BLAKE3. Writing the same content again within the same process reuses the remembered
+        SHA-1 instead of hashing the data with SHA-1 again; whether the object is stored is still
+        checked, so an object removed from disk is written again. The SHA-1 remains the object name.
+        The last `_OBJECT_WRITE_CACHE_ENTRIES` fingerprints are remembered.
     """
     data = obj.serialize()
+    header = b"%s %d\x00" % (obj.object_type, len(data))
 
-    object_format = object_format.object_type + b' ' + str(len(data)).encode() + b'\x00' + data
-    sha = hashlib.sha1(object_format).hexdigest()
+    if blake3 is None:
+        return _object_write_raw(header, data, repo)
 
-    if repo:
-        path = repo_file(repo, "objects", sha[0:2], sha[2:], mkdir=True)
+    key = (obj.object_type, blake3.blake3(data).digest()[:16])
+    with _OBJECT_WRITE_CACHE_LOCK:
+        sha = _OBJECT_WRITE_CACHE.pop(key, None)
+        if sha is not None:
+            _OBJECT_WRITE_CACHE[key] = sha
+
+    sha = _object_write_raw(header, data, repo, sha)
+
+    with _OBJECT_WRITE_CACHE_LOCK:
+        _OBJECT_WRITE_CACHE[key] = sha
+        if len(_OBJECT_WRITE_CACHE) > _OBJECT_WRITE_CACHE_ENTRIES:
+            del _OBJECT_WRITE_CACHE[next(iter(_OBJECT_WRITE_CACHE))]
+    return sha
+
+def blob_write(data, repo=None):
+    """
+    Writes raw file content as a blob and returns its SHA-1 hash.
+
+    This is a specialization of `object_write` for blobs, which make up most writes. A blob's
+    serialized form is its content, so the header is built directly from `data` without
+    allocating a `GitBlob` or dispatching through `serialize()`.
+
+    Args:
+        data (bytes): The content of the blob.
+        repo (GitRepository, optional): The repository where the blob should be saved.
+                                        Defaults to None (only the SHA is computed).
+
+    Returns:
+        str: The SHA-1 hash of the blob.
+
+    Example:
+        >> sha = blob_write(b"Hello, World!", repo)
+    """
+    return _object_write_raw(b"%s %d\x00" % (BLOB, len(data)), data, repo)
+
+_STREAM_CHUNK = 1 << 20
+
+def _blob_write_stream(file, size, repo):
+    """
+    Hashes, and optionally stores, a blob read from `file` without loading it into memory.
+
+    A first pass reads the content in `_STREAM_CHUNK` pieces and only updates the SHA-1. If no
+    repository is given, or the object is already stored, that is all. Otherwise a second pass
+    re-reads the file, compressing it chunk by chunk into a temporary file in `.git/objects/`,
+    which is then renamed into place. The second pass hashes again and refuses to store content
+    that no longer matches the name from the first pass.
+
+    Args:
+        file (file-like object): A seekable file opened in binary mode, positioned at the start of the content.
+        size (int): The number of bytes left in `file`, used for the object header.
+        repo (GitRepository or None): The repository to write to, or None to only hash.
+
+    Returns:
+        str: The SHA-1 hash of the blob.
+
+    Raises:
+        Exception: If the file does not contain `size` bytes or changes between the two passes.
+    """
+    header = b"%s %d\x00" % (BLOB, size)
+    start = file.tell()
+
+    h = hashlib.sha1(header)
+    total = 0
+    while (buf := file.read(_STREAM_CHUNK)):
+        h.update(buf)
+        total += len(buf)
+    if total != size:
+        raise Exception(f"File changed while hashing: expected {size} bytes, read {total}")
+    sha = h.hexdigest()
+
+    if not repo:
+        return sha
+
+    if _object_known(repo, sha):
+        return sha
+    level = _compression_level(repo)
+    file.seek(start)
+
+    def write(out):
+        h = hashlib.sha1(header)
+        z = zlib.compressobj(level)
+        out.write(z.compress(header))
+        while (buf := file.read(_STREAM_CHUNK)):
+            h.update(buf)
+            out.write(z.compress(buf))
+        out.write(z.flush())
+
+        if h.hexdigest() != sha:
+            raise Exception(f"File changed while writing object {sha}")
+
+    _object_store(repo, sha, write)
+    return sha
+
+def _object_write_raw(header, data, repo, sha=None):
+    """
+    Hashes an object given as its header and payload, and stores it in `repo` if it is missing.
+
+    libdeflate only compresses contiguous buffers, so header and payload are joined for it. The
+    `zlib` fallback streams them through one compressor without joining them.
+
+    Args:
+        header (bytes): The object header, `<object_type> <size>\x00`.
+        data (bytes): The serialized object payload.
+        repo (GitRepository or None): The repository to write to, or None to only hash.
+        sha (str, optional): The already known SHA-1 hash of the object, to skip hashing it again.
+
+    Returns:
+        str: The SHA-1 hash of the object.
+    """
+    if sha is None:
+        h = hashlib.sha1(header)
+        h.update(data)
+        sha = h.hexdigest()
+
+    if repo and not _object_known(repo, sha):
+        level = _compression_level(repo)
+
+        def write(f):
+            if deflate is not None:
+                f.write(_compress(header + data, level))
+            else:
+                # Feed header and payload separately instead of building header + data.
+                z = zlib.compressobj(level)
+                f.write(z.compress(header))
+                f.write(z.compress(data))
+                f.write(z.flush())
+
+        _object_store(repo, sha, write)
 
-        if not os.path.exists(path):
-            with open(path, 'wb') as f:
-                f.write(zlib.compress(object_format))
-    
     return sha
 
+def _object_store(repo, sha, write):
+    """
+    Atomically stores the loose object `sha` in `repo`.
+
+    `write` is called with a binary file to write the compressed object into. That file is a
+    temporary one in the object's fan-out directory; only once `write` has returned is it made
+    read-only, as git does, and renamed to the object's name. If `write` raises, the temporary
+    file is removed, so a failed write never leaves a truncated object behind that would later be
+    taken for a stored one.
+
+    Args:
+        repo (GitRepository): The repository to write to.
+        sha (str): The SHA-1 hash of the object.
+        write (callable): Writes the zlib-compressed object to the file it is given.
+    """
+    import tempfile
+
+    path = repo_file(repo, "objects", sha[0:2], sha[2:], mkdir=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix="tmp_obj_")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+
+        # mkstemp creates the file 0600; loose objects are read-only for everyone, as in git.
+        os.chmod(tmp, 0o444)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+    repo._known_shas[sha[0:2]].add(sha[2:])
+
+def _object_known(repo, sha):
+    """
+    Tells whether `repo` already stores the loose object `sha`, without a `stat` per new object.
+
+    The first lookup in a fan-out directory lists it once with `os.scandir` and remembers the
+    names in `repo._known_shas`; writers add the objects they create. A name missing from that
+    set is answered without touching the disk, which is the common case when writing new content.
+    A name found in it is confirmed with a `stat`, since the file may have been removed by another
+    process; if it is gone, it is dropped from the set so that the caller writes it again.
+
+    Args:
+        repo (GitRepository): The repository to check.
+        sha (str): The SHA-1 hash of the object.
+
+    Returns:
+        bool: True if the object file exists.
+    """
+    known = repo._known_shas.get(sha[0:2])
+    if known is None:
+        try:
+            with os.scandir(f"{repo.objects_dir}{os.sep}{sha[0:2]}") as entries:
+                known = {e.name for e in entries}
+        except FileNotFoundError:
+            known = set()
+        repo._known_shas[sha[0:2]] = known
+
+    if sha[2:] not in known:
+        return False
+    if os.path.exists(repo.object_path(sha)):
+        return True
+    known.discard(sha[2:])
+    return False
+
 def object_find(repo, name, object_type=None, follow=True):
     """
     Finds and returns the SHA-1 hash corresponding to the given object name.
@@ -602,27 +1427,39 @@ def object_hash(file, object_type, repo=None):
         'e69de29bb2d1d6434b8b29ae775ad8c2e48c5391'  # The SHA-1 hash of the object.
     
     Explanation:
-        1. The file is read, and the binary content is loaded into memory.
-        2. A corresponding Git object is created based on the provided `object_type`.
+        1. Blobs read from regular files larger than `_STREAM_CHUNK` are streamed through SHA-1 chunk by
+           chunk, so memory use does not grow with the file. When writing, a second streaming pass
+           compresses the file, and only if the object is not stored yet.
+        2. Otherwise the binary content is loaded into memory. Blobs are handed straight to `blob_write`.
+           For other types, a corresponding Git object is created based on the provided `object_type`.
         3. The object is written to the repository (if `repo` is provided) and its SHA-1 hash is computed.
         4. The function returns the computed SHA-1 hash of the object.
     """
-    data = file.read()
+    if object_type == BLOB:
+        try:
+            st = os.fstat(file.fileno())
+        except (AttributeError, OSError):
+            st = None
+
+        if st is not None and stat.S_ISREG(st.st_mode):
+            size = st.st_size - file.tell()
+            if size > _STREAM_CHUNK:
+                return _blob_write_stream(file, size, repo)
+
+        return blob_write(file.read(), repo)
 
-    match object_type:
-        case b'blob'    : obj = GitBlob(data)
-        case b'commit'  : obj = GitCommit(data)
-        case b'tag'     : obj = GitTag(data)
-        case b'tree'    : obj = GitTree(data)
-        case _          : raise Exception(f"Unknown type {object_type}")
+    data = file.read()
+    c = _TYPE_CLS.get(object_type)
+    if c is None:
+        raise Exception(f"Unknown type {object_type}")
     
-    return object_write(obj, repo)
+    return object_write(c(data), repo)
 
 def kvlm_serialize(kvlm):
     """
     Serializes a Key-Value List with Message (KVLM) dictionary into raw byte data.
     
-    The function takes an ordered dictionary representing a KVLM structure, which 
+    The function takes an insertion-ordered dictionary representing a KVLM structure, which 
     is commonly used in Git commit and tag objects, and converts it back into the 
     raw byte format used for storage.
 
@@ -631,8 +1468,8 @@ def kvlm_serialize(kvlm):
 
     Parameters:
     -----------
-    kvlm : OrderedDict
-        An ordered dictionary containing the KVLM data to be serialized.
+    kvlm : dict
+        An insertion-ordered dictionary containing the KVLM data to be serialized.
         - Keys are bytes representing the metadata fields.
         - Values can be bytes or lists of bytes for fields with multiple entries.
         - The commit message should be stored under the None key.
@@ -647,11 +1484,11 @@ def kvlm_serialize(kvlm):
 
     Example:
     --------
-    >> kvlm = collections.OrderedDict([
+    >> kvlm = dict([
     ..     (b'tree', b'abc123'),
     ..     (b'parent', [b'def456', b'ghi789']),
     ..     (b'author', b'John Doe <john@example.com> 1234567890 +0000'),
-    ..     (None, b'Commit message here')
+    ..     (None, b'Commit message here\n')
     .. ])
     >> raw_data = kvlm_serialize(kvlm)
     >> print(raw_data)
@@ -663,8 +1500,10 @@ def kvlm_serialize(kvlm):
     ------
     - Multi-line values are formatted with continuation lines, 
       where newlines are followed by a space.
-    - The commit message is preceded and followed by a blank line, 
-      as required by the KVLM format.
+    - The commit message is preceded by a blank line, as required by the 
+      KVLM format, and written back exactly as `kvlm_parse` stored it 
+      (including its trailing newline), so parsing and serializing a 
+      commit reproduces the original bytes and SHA-1.
     - Fields with multiple entries (e.g., 'parent') are serialized individually.
 
     Raises:
@@ -672,7 +1511,7 @@ def kvlm_serialize(kvlm):
     KeyError
         If the None key (commit message) is missing in the input dictionary.
     """
-    obj = b''
+    parts = []
 
     for key in kvlm.keys():
         if key == None:
@@ -683,10 +1522,16 @@ def kvlm_serialize(kvlm):
             value = [value]
         
         for val in value:
-            obj += key + b' ' + (val.replace(b'\n', b'\n ')) + b'\n'
+            parts.append(key)
+            parts.append(b' ')
+            parts.append(val if b'\n' not in val else val.replace(b'\n', b'\n '))
+            parts.append(b'\n')
     
-    obj = b'\n' + kvlm[None] + b'\n'
-    return obj
+    parts.append(b'\n')
+    parts.append(kvlm[None])
+    return b''.join(parts)
+
+_KVLM_END_RE = re.compile(rb'\n(?! )')
 
 def kvlm_parse(raw, start=0, _dict=None):
     """
@@ -696,8 +1541,8 @@ def kvlm_parse(raw, start=0, _dict=None):
     pairs followed by a message. This function handles multi-line values, 
     continuation lines, and fields with multiple values.
 
-    The function is recursive and processes the raw data until it reaches 
-    the commit message, storing key-value pairs in an ordered dictionary.
+    The function loops over the header lines until it reaches the commit 
+    message, storing key-value pairs in an insertion-ordered dictionary.
 
     Parameters:
     -----------
@@ -705,14 +1550,14 @@ def kvlm_parse(raw, start=0, _dict=None):
         The raw commit data as a byte string.
     start : int, optional
         The starting index for parsing (default is 0).
-    _dict : OrderedDict, optional
-        An ordered dictionary to store the parsed key-value pairs 
-        (default is None, which initializes a new OrderedDict).
+    _dict : dict, optional
+        A dictionary to store the parsed key-value pairs 
+        (default is None, which initializes a new dict).
 
     Returns:
     --------
-    OrderedDict
-        An ordered dictionary containing the parsed key-value pairs, 
+    dict
+        An insertion-ordered dictionary containing the parsed key-value pairs, 
         with the commit message stored under the None key.
         - Keys are bytes representing the metadata fields.
         - Values can be bytes or lists of bytes for fields with multiple entries.
@@ -732,8 +1577,10 @@ def kvlm_parse(raw, start=0, _dict=None):
 
     Notes:
     ------
-    - Handles continuation lines by replacing leading spaces with newlines.
-    - Uses recursion to parse through the entire KVLM structure.
+    - Handles continuation lines by replacing leading spaces with newlines. The end of a 
+      value is found with one search for a newline not followed by a space.
+    - Parses iteratively, so the number of header fields is not bounded by 
+      the recursion limit.
     - The commit message is stored under the None key after parsing key-value pairs.
 
     Raises:
@@ -742,35 +1589,37 @@ def kvlm_parse(raw, start=0, _dict=None):
         If the new line position is not equal to the starting position, 
         indicating an invalid KVLM format.
     """
-    if not _dict:
-        _dict = collections.OrderedDict()
-    
-    space = raw.find(b' ', start)
-    new_line = raw.find(b'\n', start)
+    if _dict is None:
+        _dict = {}
 
-    if space < 0 or new_line < space:
-        assert new_line == start
-        _dict[None] = raw[start + 1]
-        return _dict
-    
-    key = raw[start:space]
-    end = start
-    while True:
-        end = raw.find(b'\n', end + 1)
-        if raw[end + 1] != ord(' '):
+    while start < len(raw):
+        # Only look for the key separator on the current line, so a header-less line
+        # never makes the search run on through the whole message.
+        new_line = raw.find(b'\n', start)
+        space = raw.find(b' ', start, new_line) if new_line >= 0 else -1
+
+        if space < 0:
+            assert new_line == start
             break
-    
-    value = raw[space+1:end].replace(b'\n ', b'\n')
 
-    if key in _dict:
-        if type(_dict[key]) == list:
-            _dict[key].append(value)
+        key = raw[start:space]
+        m = _KVLM_END_RE.search(raw, new_line)
+        end = m.start() if m else len(raw)
+
+        value = raw[space+1:end].replace(b'\n ', b'\n')
+
+        if key in _dict:
+            if type(_dict[key]) == list:
+                _dict[key].append(value)
+            else:
+                _dict[key] = [_dict[key], value]
         else:
-            _dict[key] = [_dict[key], value]
-    else:
-        _dict[key] = value
-    
-    return kvlm_parse(raw, start=end+1, _dict=_dict)
+            _dict[key] = value
+
+        start = end + 1
+
+    _dict[None] = raw[start + 1:]
+    return _dict
 
 #------------------------------------------------------------------------------------------------#
 #                                     Bridging Functions                                         #
@@ -785,7 +1634,7 @@ def cmd_cat_file(args):
 
 def cmd_hash_object(args):
     if args.write:
-        repo = repo_file()
+        repo = repo_find()
     else:
         repo = None
     
@@ -800,7 +1649,10 @@ def main(argv=sys.argv[1:]):
     Args:
         argv (list): Command-line arguments passed to the program.
     """
-    args = argparse.parse_args(argv)
+    args = _parse_args(argv)
+    if args is None:
+        args = _build_argparser().parse_args(argv)
+
     match args.command:
         case "add"              : cmd_add(args)
         case "cat-file"         : cmd_cat_file(args)